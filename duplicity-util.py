@@ -15,10 +15,25 @@
 # <https://www.gnu.org/licenses/>
 
 import argparse
+import concurrent.futures
+import ctypes
+import functools
 import sys
 import yaml
 import os
+import pickle
 import re
+import selectors
+import shlex
+import threading
+import time
+
+# Use the LibYAML-backed loader when the C bindings are available; it parses
+# the same safe subset several times faster than the pure-Python SafeLoader.
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
 from datetime import datetime, date
 from colorama import init, Fore, Style
 import subprocess
@@ -28,6 +43,77 @@ init()
 
 CONFIG_FILE = "/usr/local/etc/duplicity_backup_jobs.yaml"
 ENV_FILE = "/usr/local/etc/duplicity_env.sh"
+CACHE_DIR = "/var/cache/duplicity-util"
+
+# Interval pattern for Duplicity time formats, compiled once at import
+_INTERVAL_RE = re.compile(r'^(\d+[smhDWMY])+$')
+
+# Date formats accepted by --time; strptime both matches and validates them
+_DATE_FORMATS = (
+    '%Y/%m/%d',     # YYYY/MM/DD
+    '%Y-%m-%d',     # YYYY-MM-DD
+    '%m/%d/%Y',     # MM/DD/YYYY
+    '%m-%d-%Y'      # MM-DD-YYYY
+)
+
+# Simple "KEY=value" / "export KEY=value" assignment in the env file
+_SHELL_VAR_RE = re.compile(r'^\s*(?:export\s+)?([A-Za-z_][A-Za-z0-9_]*)=(.*)$')
+
+# $VAR / ${VAR} reference inside an env file value
+_ENV_REF_RE = re.compile(r'\$(?:\{([A-Za-z_][A-Za-z0-9_]*)\}|([A-Za-z_][A-Za-z0-9_]*))')
+
+# ANSI sequences cached once; also precomputed as bytes for the buffered writer
+_GREEN_BRIGHT = Style.BRIGHT + Fore.GREEN
+_RED = Fore.RED
+_RESET = Style.RESET_ALL
+_GREEN_BRIGHT_B = _GREEN_BRIGHT.encode()
+_RESET_B = _RESET.encode()
+
+# Keep output lines whole when jobs run concurrently (--all --parallel)
+_print_lock = threading.Lock()
+
+# Linux ioprio_set(2) has no libc wrapper; syscall number is per-arch
+_SYS_IOPRIO_SET = 251  # x86_64
+_IOPRIO_WHO_PROCESS = 1
+_IOPRIO_CLASS_SHIFT = 13
+
+
+class _BufferedPrinter:
+    """Accumulate colored output lines and flush to stdout in ~64KB chunks"""
+
+    def __init__(self, limit=65536):
+        self._buf = bytearray()
+        self._limit = limit
+        self._use_color = sys.stdout.isatty()
+
+    def write(self, line):
+        """Queue one line (without trailing newline) for output"""
+        if isinstance(line, str):
+            line = line.encode('utf-8', 'replace')
+        if self._use_color:
+            self._buf += _GREEN_BRIGHT_B
+            self._buf += line
+            self._buf += _RESET_B
+        else:
+            self._buf += line
+        self._buf += b'\n'
+        if len(self._buf) > self._limit:
+            self.flush()
+
+    def flush(self):
+        if self._buf:
+            with _print_lock:
+                sys.stdout.flush()  # keep ordering with regular print() output
+                sys.stdout.buffer.write(self._buf)
+                sys.stdout.buffer.flush()
+            del self._buf[:]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.flush()
+
 
 class BackupManager:
     def __init__(self, config_file=CONFIG_FILE, env_file=ENV_FILE, nice_level=19, ionice_class=2, ionice_level=7):
@@ -36,48 +122,274 @@ class BackupManager:
         self.nice_level = nice_level
         self.ionice_class = ionice_class
         self.ionice_level = ionice_level
+        # Colors are pure overhead when piped to a file or journald
+        self._color_stdout = sys.stdout.isatty()
+        self._color_stderr = sys.stderr.isatty()
         self.config = self._load_config()
-        self.env = self._load_env()
+        # Per-job destinations, computed once
+        dest = self.config.get('destination', '')
+        self._destinations = {name: dest + name for name in self.jobs}
+        # Backup argv per job, built on first use (only --progress varies)
+        self._backup_commands = {}
+        # --all batches cache cleanups into one pass at the end of the run
+        self.defer_cache_cleanup = False
+        self._pending_cleanup = set()
+        self._apply_priorities()
+
+    @functools.cached_property
+    def env(self):
+        """Environment from the env file, loaded lazily on first use; actions
+        that never run duplicity (like 'list') skip the load entirely"""
+        return self._load_env()
+
+    @functools.cached_property
+    def _base_env(self):
+        """Merged once; rebuilding os.environ.copy() per command is wasted work"""
+        return {**os.environ, **self.env, 'PYTHONIOENCODING': 'utf-8'}
+
+    @functools.cached_property
+    def _duplicity_options(self):
+        """DUPLICITY_OPTIONS never changes after construction; tokenize once"""
+        return shlex.split(self._base_env.get('DUPLICITY_OPTIONS', ''))
+
+    @functools.cached_property
+    def _archive_dir(self):
+        return self._base_env.get('DUPLICITY_ARCHIVE_DIR', '')
+
+    @functools.cached_property
+    def _cache_dirs(self):
+        """Per-job local cache dir, computed once"""
+        return {name: f"{self._archive_dir}/{name}" for name in self.jobs}
+
+    def _apply_priorities(self):
+        """
+        Apply CPU and IO priorities to this process once; child commands
+        inherit them. os.nice() increments are cumulative, so calling it per
+        command made the niceness drift under --all.
+        """
+        try:
+            current = os.nice(0)
+            os.nice(self.nice_level - current)
+        except OSError as e:
+            self._print_error(f"Warning: could not set nice level: {e}")
+
+        if self.ionice_class in [1, 2, 3]:
+            if not self._set_ioprio():
+                # Fall back to the ionice binary when the syscall is unavailable
+                ionice_cmd = ["ionice", "-c", str(self.ionice_class)]
+                if self.ionice_class == 2:  # best-effort class requires a level
+                    ionice_cmd.extend(["-n", str(self.ionice_level)])
+
+                try:
+                    subprocess.call(ionice_cmd + ["--ignore", "-p", str(os.getpid())])
+                except OSError as e:
+                    self._print_error(f"Warning: could not set IO priority: {e}")
+
+    def _set_ioprio(self):
+        """Set IO priority with a direct ioprio_set syscall (no ionice fork)"""
+        if os.uname().machine != 'x86_64':
+            # Syscall numbers differ across architectures
+            return False
+        level = self.ionice_level if self.ionice_class == 2 else 0
+        ioprio = (self.ionice_class << _IOPRIO_CLASS_SHIFT) | level
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            return libc.syscall(_SYS_IOPRIO_SET, _IOPRIO_WHO_PROCESS, 0, ioprio) == 0
+        except (OSError, AttributeError):
+            return False
     
+    @property
+    def jobs(self):
+        """Configured jobs dict (empty when the config is missing/invalid)"""
+        return self.config.get('jobs', {})
+
     def _print_success(self, message):
-        """Print success message in green"""
-        print(f"{Style.BRIGHT}{Fore.GREEN}{message}{Style.RESET_ALL}")
+        """Print success message in green (plain when stdout is not a TTY)"""
+        with _print_lock:
+            if self._color_stdout:
+                print(f"{_GREEN_BRIGHT}{message}{_RESET}")
+            else:
+                print(message)
 
     def _print_error(self, message):
-        """Print error message in red"""
-        print(f"{Fore.RED}{message}{Style.RESET_ALL}", file=sys.stderr)
+        """Print error message in red (plain when stderr is not a TTY)"""
+        with _print_lock:
+            if self._color_stderr:
+                print(f"{_RED}{message}{_RESET}", file=sys.stderr)
+            else:
+                print(message, file=sys.stderr)
+
+    def _cache_load(self, prefix, path, st):
+        """Return the cached parse when it matches (path, mtime, size), else None"""
+        try:
+            with open(f"{CACHE_DIR}/{prefix}.pkl", 'rb') as f:
+                src_path, mtime_ns, size, data = pickle.load(f)
+        except Exception:
+            return None
+        if (src_path, mtime_ns, size) != (path, st.st_mtime_ns, st.st_size):
+            return None
+        return data
+
+    def _cache_store(self, prefix, path, st, data):
+        """Atomically write the cache pickle (best-effort)"""
+        try:
+            # The env cache holds credentials: keep the dir and files private
+            os.makedirs(CACHE_DIR, mode=0o700, exist_ok=True)
+            tmp_path = f"{CACHE_DIR}/{prefix}.pkl.{os.getpid()}.tmp"
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((path, st.st_mtime_ns, st.st_size, data), f,
+                            pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, f"{CACHE_DIR}/{prefix}.pkl")
+        except OSError:
+            # Cache is an optimization only; an unwritable cache dir is fine
+            pass
+
+    def _normalize_config(self, config):
+        """Guarantee the keys every caller touches exist and the
+        duration-bearing job fields are usable"""
+        if not isinstance(config, dict):
+            config = {}
+        config.setdefault('jobs', {})
+        config.setdefault('destination', '')
+        # retention and fullifolder are day counts consumed as integers
+        # (f"{retention}D", fullifolder * 86400); reject bad values at
+        # load time instead of on first use
+        for name in list(config['jobs']):
+            job = config['jobs'][name]
+            if not isinstance(job, dict):
+                self._print_error(f"Error: job '{name}' is not a mapping, skipping it")
+                del config['jobs'][name]
+                continue
+            for key in ('retention', 'fullifolder'):
+                value = job.get(key)
+                if value is not None and (isinstance(value, bool)
+                                          or not isinstance(value, int) or value < 0):
+                    self._print_error(
+                        f"Error: job '{name}': invalid {key} '{value}' "
+                        f"(expected a number of days), skipping the job")
+                    del config['jobs'][name]
+                    break
+        return config
 
     def _load_config(self):
         """Load jobs configuration from YAML file"""
+        try:
+            st = os.stat(self.config_file)
+        except FileNotFoundError:
+            self._print_error(f"Error: Configuration file '{self.config_file}' not found")
+            return self._normalize_config({})
+
+        # Reuse the parsed config when the YAML file hasn't changed
+        cached = self._cache_load('jobs', self.config_file, st)
+        if cached is not None:
+            return self._normalize_config(cached)
+
         try:
             with open(self.config_file, 'r') as f:
-                return yaml.safe_load(f)
+                config = yaml.load(f, Loader=_SafeLoader)
         except FileNotFoundError:
             self._print_error(f"Error: Configuration file '{self.config_file}' not found")
-            return {}
+            return self._normalize_config({})
         except yaml.YAMLError as e:
             self._print_error(f"Error loading YAML file: {e}")
-            return {}
+            return self._normalize_config({})
+
+        config = self._normalize_config(config)
+        self._cache_store('jobs', self.config_file, st, config)
+        return config
         
     def _load_env(self):
         """Load environment variables from shell script"""
         try:
-            # Read the environment file and extract variables
-            cmd = f"source {self.env_file} && env"
-            pipe = subprocess.Popen(cmd, stdout=subprocess.PIPE, shell=True, executable='/bin/bash')
-            output = pipe.communicate()[0].decode('utf-8')
-            
-            env = {}
-            for line in output.splitlines():
-                if '=' in line:
-                    key, value = line.split('=', 1)
-                    env[key] = value
+            st = os.stat(self.env_file)
+        except OSError:
+            st = None
+
+        # Reuse the parsed environment when the shell file hasn't changed
+        if st is not None:
+            cached = self._cache_load('env', self.env_file, st)
+            if cached is not None:
+                return cached
 
+        try:
+            env = self._parse_env_file()
+            if env is None:
+                # File uses real shell features; let bash evaluate it.
+                # Never cache this result: it is a full env(1) dump, so it
+                # would freeze inherited variables from this invocation
+                # context into later runs
+                return self._load_env_from_shell()
+
+            if st is not None:
+                self._cache_store('env', self.env_file, st, env)
             return env
         except Exception as e:
             self._print_error(f"Error loading environment variables: {e}")
             return {}
 
+    def _parse_env_file(self):
+        """
+        Parse simple "KEY=value" / "export KEY=value" lines without forking
+        a shell, expanding $VAR/${VAR} references in place. Returns None if
+        the file needs real shell evaluation (command substitution, ...).
+        """
+        with open(self.env_file, 'r') as f:
+            content = f.read()
+
+        env = {}
+        for line in content.splitlines():
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if '`' in line or '$(' in line:
+                # Command substitution: bash territory
+                return None
+            match = _SHELL_VAR_RE.match(line)
+            if not match:
+                return None
+            key, value = match.groups()
+            # A quoted value ends at its closing quote; an unquoted one ends
+            # at the first whitespace. Whatever follows may only be an
+            # inline comment — anything else is left to bash
+            quote = ''
+            if value[:1] in ("'", '"'):
+                quote = value[0]
+                end = value.find(quote, 1)
+                if end == -1:
+                    return None  # unterminated quote
+                rest = value[end + 1:].lstrip()
+                value = value[1:end]
+            else:
+                parts = value.split(None, 1)
+                value = parts[0] if parts else ''
+                rest = parts[1] if len(parts) > 1 else ''
+            if rest and not rest.startswith('#'):
+                return None
+            # Expand variable references against earlier assignments, then
+            # the process environment (single quotes suppress expansion)
+            if quote != "'" and '$' in value:
+                value = _ENV_REF_RE.sub(
+                    lambda m: env.get(m.group(1) or m.group(2),
+                                      os.environ.get(m.group(1) or m.group(2), '')),
+                    value
+                )
+            env[key] = value
+        return env
+
+    def _load_env_from_shell(self):
+        """Source the environment file in bash and extract the variables"""
+        cmd = f"source {self.env_file} && env"
+        pipe = subprocess.Popen(cmd, stdout=subprocess.PIPE, shell=True, executable='/bin/bash')
+        output = pipe.communicate()[0].decode('utf-8')
+
+        env = {}
+        for line in output.splitlines():
+            if '=' in line:
+                key, value = line.split('=', 1)
+                env[key] = value
+        return env
+
     def _validate_time_format(self, time_str):
         """
         Validate time string according to Duplicity's time formats:
@@ -86,63 +398,25 @@ class BackupManager:
         2. Interval format: "<number>(s|m|h|D|W|M|Y)" (can be combined)
         3. Date format: YYYY/MM/DD, YYYY-MM-DD, MM/DD/YYYY, MM-DD-YYYY
         """
-        # Check ISO datetime format
-        iso_datetime_pattern = r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}[+-]\d{2}:\d{2}$'
-        if re.match(iso_datetime_pattern, time_str):
-            try:
-                # Alternative to fromisoformat for Python < 3.7
-                # First try dateutil if available
-                try:
-                    import dateutil.parser
-                    dateutil.parser.isoparse(time_str)
-                    return True
-                except ImportError:
-                    # Manual parsing fallback
-                    date_part, time_part = time_str.split('T', 1)
-                    time_part, offset_part = time_part.rsplit('+', 1) if '+' in time_part else time_part.rsplit('-', 1)
-                    
-                    # Parse date
-                    year, month, day = map(int, date_part.split('-'))
-                    
-                    # Parse time
-                    hour, minute, second = map(int, time_part.split(':'))
-                    
-                    # Basic validation
-                    if not (1 <= month <= 12 and 1 <= day <= 31 and 
-                            0 <= hour <= 23 and 0 <= minute <= 59 and 0 <= second <= 59):
-                        raise ValueError("Invalid date/time values")
-                    
-                    return True
-            except Exception:
-                return False
+        # Check ISO datetime format; fromisoformat parses and validates in
+        # one C call, no regex pre-filter needed
+        try:
+            datetime.fromisoformat(time_str)
+            return True
+        except ValueError:
+            pass
 
-        # Check interval format
-        interval_pattern = r'^(\d+[smhDWMY])+$'
-        if re.match(interval_pattern, time_str):
-            # Validate each interval component
-            components = re.findall(r'\d+[smhDWMY]', time_str)
-            for comp in components:
-                if not re.match(r'\d+[smhDWMY]$', comp):
-                    break
-            else:
-                return True
+        # Check interval format; one fullmatch proves every component valid
+        if _INTERVAL_RE.fullmatch(time_str):
+            return True
 
         # Check date formats
-        date_patterns = [
-            (r'^\d{4}/\d{1,2}/\d{1,2}$', '%Y/%m/%d'),     # YYYY/MM/DD
-            (r'^\d{4}-\d{1,2}-\d{1,2}$', '%Y-%m-%d'),     # YYYY-MM-DD
-            (r'^\d{1,2}/\d{1,2}/\d{4}$', '%m/%d/%Y'),     # MM/DD/YYYY
-            (r'^\d{1,2}-\d{1,2}-\d{4}$', '%m-%d-%Y')      # MM-DD-YYYY
-        ]
-
-        for pattern, date_format in date_patterns:
-            if re.match(pattern, time_str):
-                try:
-                    # Try to parse the date to validate it
-                    datetime.strptime(time_str, date_format)
-                    return True
-                except ValueError:
-                    continue
+        for date_format in _DATE_FORMATS:
+            try:
+                datetime.strptime(time_str, date_format)
+                return True
+            except ValueError:
+                continue
 
         raise ValueError(
             "Invalid time format. Accepted formats:\n"
@@ -158,71 +432,67 @@ class BackupManager:
         )
 
     def _run_duplicity_command(self, command, job_name=None):
-        """Run a duplicity command with the proper environment and options"""
+        """Run a duplicity command (an argv list) with the proper environment and options"""
         try:
-            # Combine current environment with duplicity-specific environment
-            env = os.environ.copy()
-            env.update(self.env)
-
-            # Get duplicity options from environment
-            duplicity_options = env.get('DUPLICITY_OPTIONS', '')          
-
-            # Insert options right after 'duplicity' command but before the rest
-            if 'duplicity' in command:
-                # Split command into parts
-                cmd_parts = command.split(' ', 1)
-                # Reconstruct command with options
-                if job_name:
-                    command = f"{cmd_parts[0]} {duplicity_options} --name={job_name} {cmd_parts[1]}"
-                else:
-                    command = f"{cmd_parts[0]} {duplicity_options} {cmd_parts[1]}"
-
-            # Apply nice and ionice directly to the duplicity command itself
-            # NOT as a prefix to the entire command string
-            env['PYTHONIOENCODING'] = 'utf-8'  # Ensure proper encoding for output
-
-            # Check if command is a string or list
-            if isinstance(command, str):
-                # Convert string command to list for subprocess
-                cmd_list = command.split()
-            else:
-                # Command is already a list
-                cmd_list = command
+            # Current environment combined with duplicity-specific environment
+            env = self._base_env
 
-            self._print_success(f"Executing command: {command}")
+            # Insert options right after the 'duplicity' command but before the rest
+            cmd_list = list(command)
+            if cmd_list and cmd_list[0] == 'duplicity':
+                options = self._duplicity_options
+                if job_name:
+                    options = options + [f"--name={job_name}"]
+                cmd_list[1:1] = options
 
-            # Use os.nice to set process priority
-            os.nice(self.nice_level)
-            
-            # Set ionice via a separate command before launching duplicity
-            if self.ionice_class in [1, 2, 3]:
-                ionice_cmd = ["ionice", "-c", str(self.ionice_class)]
-                if self.ionice_class == 2:  # best-effort class requires a level
-                    ionice_cmd.extend(["-n", str(self.ionice_level)])
-                    
-                # Apply ionice to the current process
-                subprocess.call(ionice_cmd + ["--ignore", "-p", str(os.getpid())])
+            self._print_success(f"Executing command: {' '.join(cmd_list)}")
 
-            # Run the command
+            # Run the command; nice/ionice were applied once at init
             process = subprocess.Popen(
                 cmd_list,
                 env=env,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                universal_newlines=True
+                shell=False
             )
 
-            # Stream output in real-time
-            while True:
-                output = process.stdout.readline()
-                if output == '' and process.poll() is not None:
-                    break
-                if output:
-                    self._print_success(output.strip())
-            
+            # Drain stdout and stderr together so a chatty stderr can never
+            # fill its pipe buffer and deadlock the child
+            sel = selectors.DefaultSelector()
+            buffers = {}
+            for pipe in (process.stdout, process.stderr):
+                os.set_blocking(pipe.fileno(), False)
+                sel.register(pipe, selectors.EVENT_READ)
+                buffers[pipe] = b''
+            error_parts = []
+
+            with _BufferedPrinter() as printer:
+                while sel.get_map():
+                    for key, _ in sel.select(timeout=0.1):
+                        pipe = key.fileobj
+                        chunk = os.read(pipe.fileno(), 65536)
+                        if not chunk:
+                            sel.unregister(pipe)
+                            continue
+                        lines = (buffers[pipe] + chunk).split(b'\n')
+                        buffers[pipe] = lines.pop()
+                        for line in lines:
+                            if pipe is process.stdout:
+                                if line:
+                                    printer.write(line.strip())
+                            else:
+                                error_parts.append(line.decode('utf-8', 'replace'))
+
+                # Flush any unterminated trailing output
+                if buffers[process.stdout]:
+                    printer.write(buffers[process.stdout].strip())
+                if buffers[process.stderr]:
+                    error_parts.append(buffers[process.stderr].decode('utf-8', 'replace'))
+            sel.close()
+
             # Get the return code and error output if any
-            rc = process.poll()
-            error_output = process.stderr.read()
+            error_output = "\n".join(error_parts)
+            rc = process.wait()
             
             if rc != 0:
                 self._print_error(f"Command failed with error:\n{error_output}")
@@ -234,43 +504,75 @@ class BackupManager:
             self._print_error(f"Error executing duplicity command: {e}")
             return False
       
+    def run_pending_cleanup(self):
+        """Run the cache cleanups deferred during an --all loop in one pass"""
+        self.defer_cache_cleanup = False
+        success = True
+        for job_name in sorted(self._pending_cleanup):
+            success = self._local_cache_cleanup(job_name) and success
+        self._pending_cleanup.clear()
+        return success
+
     def _local_cache_cleanup(self, job_name):
+        if self.defer_cache_cleanup:
+            # Amortize the tree walks: one consolidated pass at the end
+            self._pending_cleanup.add(job_name)
+            return True
+
         self._print_success(f"Starting local cache cleanup for job '{job_name}'")
-        env = os.environ.copy()
-        env.update(self.env)
-        CACHE_DIR = env.get('DUPLICITY_ARCHIVE_DIR', '')
-        job_cache_dir = f"{CACHE_DIR}/{job_name}"
+        job_cache_dir = self._cache_dirs.get(job_name) or f"{self._archive_dir}/{job_name}"
         if not os.path.exists(job_cache_dir):
             self._print_success("No cache directory found. Nothing to clean.")
             return True
-        cleanup_find_cmd = ["find", job_cache_dir, "-type", "f", "-delete", "-print"]
-        if job_name in self.config['jobs']:
-            job = self.config['jobs'][job_name]
+
+        # Without a configured retention, every cache file is deleted
+        cutoff = None
+        job = self.config.get('jobs', {}).get(job_name)
+        if job is not None:
             retention = job['retention']
             fullifolder = job.get('fullifolder', retention)
-            cleanup_find_cmd = ["find", job_cache_dir, "-type", "f", "-mtime", f"+{fullifolder}", "-delete", "-print"]
-        try:
-            self._print_success(f"Executing command: {' '.join(cleanup_find_cmd)}")
-            process = subprocess.Popen(
-                cleanup_find_cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                universal_newlines=True
-            )
-
-            while True:
-                output = process.stdout.readline()
-                if output == '' and process.poll() is not None:
-                    break
-                if output:
-                    self._print_success(f"Deleted: {output.strip()}")
+            cutoff = time.time() - fullifolder * 86400
 
-            rc = process.poll()
-            error_output = process.stderr.read()
+        try:
+            # Duplicity keeps a flat cache per job: when the top level holds
+            # only files and none is older than the cutoff, there is nothing
+            # to delete and the recursive walk can be skipped (the common
+            # cron case). Any subdirectory forces the full walk — neither a
+            # dir's own mtime nor this check says anything about the age of
+            # the files inside it.
+            if cutoff is not None:
+                skippable = True
+                with os.scandir(job_cache_dir) as entries:
+                    for entry in entries:
+                        if (not entry.is_file(follow_symlinks=False)
+                                or entry.stat(follow_symlinks=False).st_mtime < cutoff):
+                            skippable = False
+                            break
+                if skippable:
+                    self._print_success("No cache files older than retention. Nothing to clean.")
+                    return True
 
-            if rc != 0:
-                self._print_error(f"Cleanup failed with error:\n{error_output}")
-                return False
+            # Deleting by name relative to an open directory fd (unlinkat)
+            # spares the kernel a full path walk per file in large caches
+            use_dir_fd = os.unlink in os.supports_dir_fd
+            with _BufferedPrinter() as printer:
+                for root, _, _ in os.walk(job_cache_dir):
+                    dir_fd = os.open(root, os.O_RDONLY) if use_dir_fd else None
+                    try:
+                        # scandir entries carry cached stat info, no extra stat() calls
+                        for entry in os.scandir(root):
+                            if not entry.is_file(follow_symlinks=False):
+                                continue
+                            if cutoff is not None and entry.stat(follow_symlinks=False).st_mtime >= cutoff:
+                                continue
+                            if dir_fd is not None:
+                                os.unlink(entry.name, dir_fd=dir_fd)
+                            else:
+                                os.unlink(entry.path)
+                            printer.write(f"Deleted: {entry.path}")
+                    finally:
+                        if dir_fd is not None:
+                            os.close(dir_fd)
 
             self._print_success("Cache cleanup completed successfully")
             return True
@@ -319,35 +621,30 @@ class BackupManager:
             if args_display:
                 self._print_success(f"Executing pre_script: {script_path} with args: {args_display}")
             else:
-                self._print_success(f"Executing pre_script: {script_path}")    
-            process = subprocess.Popen(
-                command,
-                env=script_env,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                universal_newlines=True
-            )
-            
-            # Capture output
+                self._print_success(f"Executing pre_script: {script_path}")
+
+            # subprocess.run handles the timeout kill and pipe cleanup itself
             try:
-                stdout, stderr = process.communicate(timeout=timeout)
+                result = subprocess.run(
+                    command,
+                    env=script_env,
+                    capture_output=True,
+                    text=True,
+                    timeout=timeout,
+                    check=False
+                )
             except subprocess.TimeoutExpired:
-                process.kill()
                 return False, "", f"Script timed out after {timeout} seconds"
-            
-            # Check return code
-            if process.returncode != 0:
-                return False, stdout, stderr
-                
-            return True, stdout, stderr
-            
+
+            return result.returncode == 0, result.stdout, result.stderr
+
         except Exception as e:
             return False, "", str(e)
 
 
     def list_jobs(self):
         """List all configured backup jobs"""
-        if not self.config['jobs']:
+        if len(self.config['jobs']) == 0:
             self._print_success("No jobs configured")
             return
         
@@ -360,26 +657,32 @@ class BackupManager:
 
     def restore_job(self, job_name, restore_path=None, time_spec=None, path_to_restore=None, show_progress=False, force=False):
         """Restore a backup job"""
-       
-        source = self.config['destination'] + job_name
+
+        job = self.config.get('jobs', {}).get(job_name)
+        if job is None:
+            self._print_error(f"Error: Job '{job_name}' not found")
+            return
+
+        source = self._destinations[job_name]
         if restore_path:
             destination = restore_path
         else:
-            destination = self.config['jobs'][job_name]['source']
+            destination = job['source']
 
-        if not os.path.exists(destination):
+        # Only check existence for local paths; URLs are duplicity's business
+        if '://' not in destination and not os.path.exists(destination):
             self._print_error(f"Error: Restoration path '{destination}' does not exist")
             return
 
         # Build duplicity command
-        cmd_parts = ["duplicity restore"]
+        cmd_parts = ["duplicity", "restore"]
 
         # Show progress if requested
         if show_progress:
             cmd_parts.append("--progress")
         if force:
             cmd_parts.append("--force")
-        
+
         if time_spec:
             try:
                 self._validate_time_format(time_spec)
@@ -390,28 +693,27 @@ class BackupManager:
                 return
 
         if path_to_restore:
-            cmd_parts.append(f"--file-to-restore {path_to_restore}")
+            cmd_parts.append("--file-to-restore")
+            cmd_parts.append(path_to_restore)
 
         cmd_parts.extend([
-            f"{source}",
-            f"{destination}"
+            source,
+            destination
         ])
 
-        command = " ".join(cmd_parts)
-        self._print_success(f"Executing: {command}")
-        self._run_duplicity_command(command, job_name)
-        self._local_cache_cleanup(job_name)
+        self._print_success(f"Executing: {' '.join(cmd_parts)}")
+        success = self._run_duplicity_command(cmd_parts, job_name)
+        return self._local_cache_cleanup(job_name) and success
 
     def trigger_backup(self, job_name, show_progress=False):
         """Trigger a backup job"""
-        if job_name not in self.config['jobs']:
+        job = self.config.get('jobs', {}).get(job_name)
+        if job is None:
             self._print_error(f"Error: Job '{job_name}' not found")
             return
 
-        job = self.config['jobs'][job_name]
         source = job['source']
-        retention = job['retention']
-        destination = self.config['destination'] + job_name
+        destination = self._destinations[job_name]
 
         # Check if pre-script is defined
         pre_script = job.get('pre_script')
@@ -450,22 +752,32 @@ class BackupManager:
             else:
                 self._print_success(f"Pre-script successfully executed for job '{job_name}'")
 
-        # Build duplicity command
+        # Static argv is precomputed per job; only --progress varies per run
+        cmd_parts = list(self._backup_command(job_name, job))
+        if show_progress:
+            cmd_parts.insert(2, "--progress")
+
+        self._print_success(f"Starting backup for job '{job_name}'")
+        return self._run_duplicity_command(cmd_parts, job_name)
+
+    def _backup_command(self, job_name, job):
+        """Build (once) and return the static duplicity argv for a job"""
+        cmd_parts = self._backup_commands.get(job_name)
+        if cmd_parts is not None:
+            return cmd_parts
+
+        retention = job['retention']
         if job.get('type', 'incremental') == 'full':
-            cmd_parts = ["duplicity full"]
+            cmd_parts = ["duplicity", "full"]
         else:
             fullifolder = job.get('fullifolder', retention)
-            cmd_parts = [f"duplicity incr --full-if-older-than {fullifolder}D"]
-
-        # Show progress if requested
-        if show_progress:
-            cmd_parts.append("--progress")
+            cmd_parts = ["duplicity", "incr", "--full-if-older-than", f"{fullifolder}D"]
 
         # Add compression option (default: enabled)
         compress = job.get('compress', True)
         if not compress:
             cmd_parts.append("--no-compression")
-        
+
         # Add encryption option (default: disabled)
         encrypt = job.get('encrypt', False)
         if not encrypt:
@@ -473,59 +785,60 @@ class BackupManager:
 
         excludes = job.get('exclude', [])
         includes = job.get('include', [])
+        # Flatten to ['--include', pattern, ...] in one extend per option,
+        # stripping quotes around the patterns on the way
         if includes and isinstance(includes, list):
-            for pattern in includes:
-                # Remove quotes around the pattern
-                pattern = pattern.strip("'\"")
-                cmd_parts.append(f"--include")
-                cmd_parts.append(f"{pattern}")
+            cmd_parts.extend(x for p in includes for x in ('--include', p.strip("'\"")))
         if excludes and isinstance(excludes, list):
-            for pattern in excludes:
-                # Remove quotes around the pattern
-                pattern = pattern.strip("'\"")
-                cmd_parts.append(f"--exclude")
-                cmd_parts.append(f"{pattern}")
-        
+            cmd_parts.extend(x for p in excludes for x in ('--exclude', p.strip("'\"")))
+
         cmd_parts.extend([
-            f"{source}",
-            f"{destination}"
+            job['source'],
+            self._destinations[job_name]
         ])
-        command = " ".join(cmd_parts)
-        self._print_success(f"Starting backup for job '{job_name}'")
-        self._run_duplicity_command(command, job_name)
+        self._backup_commands[job_name] = cmd_parts
+        return cmd_parts
 
     def trigger_cleanup(self, job_name):
         """Trigger a cleanup for a job"""
-        if job_name not in self.config['jobs']:
+        job = self.config.get('jobs', {}).get(job_name)
+        if job is None:
             self._print_error(f"Error: Job '{job_name}' not found")
             return
 
-        job = self.config['jobs'][job_name]
-        destination = self.config['destination'] + job_name
+        destination = self._destinations[job_name]
         retention = job['retention']
 
         # Build duplicity command
-        command = f"duplicity remove-older-than {retention}D {destination} --force"
-        
+        command = ["duplicity", "remove-older-than", f"{retention}D", destination, "--force"]
+
         self._print_success(f"Starting cleanup for job '{job_name}'")
-        self._run_duplicity_command(command, job_name)
-        self._local_cache_cleanup(job_name)
+        success = self._run_duplicity_command(command, job_name)
+        return self._local_cache_cleanup(job_name) and success
         
 
     def get_job_status(self, job_name):
         """Get the status of a backup job"""
 
-        target = self.config['destination'] + job_name
+        target = self._destinations.get(job_name)
+        if target is None:
+            self._print_error(f"Error: Job '{job_name}' not found")
+            return
+
         self._print_success(f"Status for job '{job_name}':")
-        command = f"duplicity collection-status {target}"
-        
-        self._run_duplicity_command(command, job_name)
+        command = ["duplicity", "collection-status", target]
+
+        return self._run_duplicity_command(command, job_name)
 
     def list_job_content(self, job_name, target_date=None):
         """List the content of a backup job at specific date"""
 
-        target = self.config['destination'] + job_name
-        cmd_parts = ["duplicity list-current-files"]
+        target = self._destinations.get(job_name)
+        if target is None:
+            self._print_error(f"Error: Job '{job_name}' not found")
+            return
+
+        cmd_parts = ["duplicity", "list-current-files"]
 
         if target_date:
             try:
@@ -533,14 +846,14 @@ class BackupManager:
             except ValueError as e:
                 self._print_error(f"Error: {e}")
                 return
-            cmd_parts.append(f"-t {target_date}")
+            cmd_parts.append("-t")
+            cmd_parts.append(target_date)
             self._print_success(f"Listing content of backup '{job_name}' from {target_date}")
         else:
             self._print_success(f"Listing content of latest backup for '{job_name}'")
 
-        cmd_parts.append(f"{target}")
-        command = " ".join(cmd_parts)
-        self._run_duplicity_command(command, job_name)
+        cmd_parts.append(target)
+        self._run_duplicity_command(cmd_parts, job_name)
 
 
 def main():
@@ -562,6 +875,8 @@ def main():
                        help="IO Nice class (1:realtime, 2:best-effort, 3:idle, default: 2)")
     parser.add_argument('--ionice-level', type=int, choices=range(8), default=7,
                        help="IO Nice level (0-7, default: 7, only for best-effort class)")
+    parser.add_argument('--parallel', type=int, default=1,
+                       help="Number of jobs to run concurrently with --all (default: 1)")
     parser.add_argument('--progress', action='store_true',
                        help="Show progress during duplicity operations")
     parser.add_argument('--force', action='store_true',
@@ -596,16 +911,44 @@ def main():
         if args.job and args.all:
             print("Error: Cannot specify both --job and --all")
             sys.exit(1)
-        
+
+        if args.all and args.action not in ('backup', 'status', 'cleanup'):
+            print(f"Error: --all is not supported with the '{args.action}' action")
+            sys.exit(1)
+
         if args.all:
-            for job_name in backup_manager.jobs.keys():
+            def process_job(job_name):
                 print(f"\nProcessing job: {job_name}")
                 if args.action == 'backup':
-                    backup_manager.trigger_backup(job_name)
+                    return backup_manager.trigger_backup(job_name)
                 elif args.action == 'status':
-                    backup_manager.get_job_status(job_name)
-                elif args.action == 'cleanup':
-                    backup_manager.trigger_cleanup(job_name)
+                    return backup_manager.get_job_status(job_name)
+                else:
+                    return backup_manager.trigger_cleanup(job_name)
+
+            # Jobs target distinct destinations and are I/O-bound, so they
+            # can overlap; --parallel 1 keeps the sequential behavior
+            backup_manager.defer_cache_cleanup = True
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max(args.parallel, 1)) as executor:
+                futures = {executor.submit(process_job, name): name
+                           for name in backup_manager.jobs}
+                failed = []
+                for future in concurrent.futures.as_completed(futures):
+                    job_name = futures[future]
+                    try:
+                        success = future.result()
+                    except Exception as e:
+                        print(f"Error: job '{job_name}' raised: {e}", file=sys.stderr)
+                        success = False
+                    if not success:
+                        failed.append(job_name)
+
+            if not backup_manager.run_pending_cleanup():
+                failed.append('cache cleanup')
+
+            if failed:
+                print(f"Error: {len(failed)} job(s) failed: {', '.join(sorted(failed))}")
+                sys.exit(1)
         else:
             if args.action == 'restore':
                 backup_manager.restore_job(